@@ -0,0 +1,149 @@
+# Benchmarks for the GatorLibrary Red-Black Tree
+# Compares an iterative search from the root against finger search (off by default) for
+# sequential, clustered and random access patterns, and immediate
+# against deferred (tombstoned) deletes for a burst of delete_book calls.
+import contextlib
+import functools
+import io
+import random
+import sys
+import time
+
+from gatorLibrary import GatorLibrary
+
+
+def build_library(num_books, seed, **library_options):
+    # Build a library with the given number of books, inserted in random order.
+    # Inserts go through run_command, the same path used for input files.
+    library = GatorLibrary(**library_options)
+    book_ids = list(range(1, num_books + 1))
+    random.Random(seed).shuffle(book_ids)
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence the per-insert log lines
+        for book_id in book_ids:
+            library.run_command(f'InsertBook({book_id}, "Title {book_id}", "Author", "Yes")')
+    return library
+
+
+def sequential_pattern(num_books, num_lookups, seed):
+    # Consecutive book IDs, as in a shelving run.
+    return [(i % num_books) + 1 for i in range(num_lookups)]
+
+
+def clustered_pattern(num_books, num_lookups, seed, cluster_size=64, spread=32):
+    # Bursts of lookups around a random center, as in an inventory run over one shelf.
+    rng = random.Random(seed)
+    pattern = []
+    while len(pattern) < num_lookups:
+        center = rng.randint(1, num_books)
+        for _ in range(cluster_size):
+            pattern.append(min(num_books, max(1, center + rng.randint(-spread, spread))))
+    return pattern[:num_lookups]
+
+
+def random_pattern(num_books, num_lookups, seed):
+    # Uniformly random book IDs with no locality.
+    rng = random.Random(seed)
+    return [rng.randint(1, num_books) for _ in range(num_lookups)]
+
+
+def root_search(rb_tree, book_id):
+    # Iterative descent from the root, the baseline that finger search is compared against.
+    node = rb_tree.root
+    while node != rb_tree.NIL and book_id != node.book_id:
+        node = node.left if book_id < node.book_id else node.right
+    return node
+
+
+def time_lookups(lookup, pattern, repeat=3):
+    # Return the best total time in seconds, over repeat runs, to look up every ID in the pattern.
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for book_id in pattern:
+            lookup(book_id)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_lookup_benchmark(num_books=100000, num_lookups=200000, seed=7, finger_climb_limit=3):
+    # Compare root search with finger_search both at the library default (finger off)
+    # and with the finger enabled at the given climb limit.
+    library = build_library(num_books, seed)
+    rb_tree = library.rb_tree
+    default_limit = rb_tree.finger_climb_limit
+    patterns = [
+        ("sequential", sequential_pattern),
+        ("clustered", clustered_pattern),
+        ("random", random_pattern),
+    ]
+    print(f"{num_books} books, {num_lookups} lookups per pattern, finger_climb_limit={finger_climb_limit}")
+    print(f"{'pattern':<12}{'root (s)':>10}{'default (s)':>13}{'finger (s)':>12}{'default':>9}{'finger':>8}")
+    for name, make_pattern in patterns:
+        pattern = make_pattern(num_books, num_lookups, seed)
+        root_time = time_lookups(functools.partial(root_search, rb_tree), pattern)
+        rb_tree.finger_climb_limit = default_limit
+        default_time = time_lookups(rb_tree.finger_search, pattern)
+        rb_tree.finger_climb_limit = finger_climb_limit
+        rb_tree.finger = rb_tree.NIL  # Start each pattern from a cold finger
+        finger_time = time_lookups(rb_tree.finger_search, pattern)
+        print(f"{name:<12}{root_time:>10.3f}{default_time:>13.3f}{finger_time:>12.3f}"
+              f"{root_time / default_time:>8.2f}x{root_time / finger_time:>7.2f}x")
+    rb_tree.finger_climb_limit = default_limit
+
+
+def time_delete_burst(library, book_ids):
+    # Run delete_book for every ID, returning per-delete latencies and the total compaction time.
+    # delete_book is timed directly so that command parsing is left out of the latencies.
+    # Compaction runs between commands, as in the main loop, and is timed separately.
+    latencies = []
+    compaction_time = 0.0
+    for book_id in book_ids:
+        start = time.perf_counter()
+        library.delete_book(book_id)
+        latencies.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        library.compact_if_needed()
+        compaction_time += time.perf_counter() - start
+    latencies.sort()
+    return latencies, compaction_time
+
+
+def run_delete_benchmark(num_books=100000, num_deletes=50000, num_lookups=200000, seed=7):
+    # Delete a burst of random IDs, then measure random lookups on the remaining tree.
+    delete_ids = random.Random(seed).sample(range(1, num_books + 1), num_deletes)
+    read_pattern = random_pattern(num_books, num_lookups, seed)
+    modes = [
+        ("immediate", {}),
+        ("tombstone", {"deferred_delete": True, "tombstone_threshold": 0.25}),
+        ("tombstone*", {"deferred_delete": True, "tombstone_threshold": float("inf")}),
+    ]
+    print(f"{num_books} books, burst of {num_deletes} deletes, then {num_lookups} random lookups")
+    print("(tombstone* never compacts during the burst and is compacted after the first read pass)")
+    print("(with compact = mean delete latency plus compaction time spread over the burst)")
+    print(f"{'mode':<12}{'mean (us)':>11}{'p99 (us)':>10}{'max (us)':>10}{'compact (s)':>13}"
+          f"{'with compact (us)':>19}{'reads (s)':>11}")
+    for name, options in modes:
+        library = build_library(num_books, seed, **options)
+        latencies, compaction_time = time_delete_burst(library, delete_ids)
+        mean = sum(latencies) / len(latencies) * 1e6
+        p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+        worst = latencies[-1] * 1e6
+        amortized = mean + compaction_time / num_deletes * 1e6
+        read_time = time_lookups(library.rb_tree.finger_search, read_pattern)
+        print(f"{name:<12}{mean:>11.1f}{p99:>10.1f}{worst:>10.1f}{compaction_time:>13.3f}"
+              f"{amortized:>19.1f}{read_time:>11.3f}")
+        if library.rb_tree.tombstone_count:
+            start = time.perf_counter()
+            library.rb_tree.compact()
+            compaction_time = time.perf_counter() - start
+            read_time = time_lookups(library.rb_tree.finger_search, read_pattern)
+            print(f"{name + ' +c':<12}{'':>31}{compaction_time:>13.3f}{'':>19}{read_time:>11.3f}")
+
+
+if __name__ == "__main__":
+    # Optional arguments: number of books and number of lookups per pattern
+    num_books = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    num_lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    run_lookup_benchmark(num_books, num_lookups)
+    print()
+    run_delete_benchmark(num_books, num_books // 2, num_lookups)
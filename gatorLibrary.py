@@ -15,6 +15,7 @@ class Node:
         self.availability_status = availability_status  # Availability status of the book (e.g., available, borrowed)
         self.borrowed_by = borrowed_by  # Information about who has borrowed the book
         self.reservation_heap = reservation_heap  # Priority queue (min-heap) for managing reservations
+        self.deleted = False  # Tombstone flag set by deferred deletes until the next compaction
         # Red-Black Tree specific properties for the node
         self.color = 'black'  # Color attribute for Red-Black Tree balancing
         self.parent = None  # Parent node in the Red-Black Tree
@@ -87,8 +88,10 @@ class BinaryMinHeap:
             self._bubble_up(parent_index)
 
 class RBTree:
-    def __init__(self):
+    def __init__(self, finger_climb_limit=0):
         # Initialize the Red-Black Tree with a NIL node as the root and set its color to black.
+        # finger_climb_limit caps how many levels finger_search climbs before restarting from the root.
+        # The default of 0 keeps every lookup a plain search from the root.
         self.NIL = Node(None, None, None, None, None, BinaryMinHeap())
         self.NIL.color = 'black'
         self.NIL.left = self.NIL
@@ -96,6 +99,12 @@ class RBTree:
         self.NIL.parent = self.NIL
         self.root = self.NIL
         self.insert_fixup_count = 0
+        # Finger: the last accessed node, used as the starting point for nearby lookups.
+        self.finger = self.NIL
+        self.finger_climb_limit = finger_climb_limit
+        # Book counts used to decide when tombstoned nodes should be compacted away.
+        self.node_count = 0
+        self.tombstone_count = 0
         
     def minimum(self, node):
         # Find the node with the minimum value in the subtree rooted at the given node.
@@ -118,17 +127,20 @@ class RBTree:
         
             if z is None or z == self.NIL:
                 return  # Ensure we're not trying to delete a None or NIL node
+            if self.finger == z:
+                # Move the finger to a neighbour of the node being removed so lookups keep their locality
+                neighbour = self.successor(z) or self.predecessor(z)
+                self.finger = neighbour if neighbour is not None else self.NIL
+            self.node_count -= 1
             
             y = z
             y_original_color = y.color
             if z.left == self.NIL:
                 x = z.right
-                if x != self.NIL:  # Check if x is not NIL before transplant
-                    self.transplant(z, z.right)
+                self.transplant(z, z.right)  # Also unlinks a leaf, with NIL taking its place
             elif z.right == self.NIL:
                 x = z.left
-                if x != self.NIL:  # Check if x is not NIL before transplant
-                    self.transplant(z, z.left)
+                self.transplant(z, z.left)
             else:
                 y = self.minimum(z.right)
                 y_original_color = y.color
@@ -143,10 +155,8 @@ class RBTree:
                 y.left = z.left
                 y.left.parent = y
                 y.color = z.color
-                if x != self.NIL:  # Check if x is not NIL before setting parent
-                    x.parent = y
             if y_original_color == 'black':
-                self.delete_fixup(x if x != self.NIL else self.root)
+                self.delete_fixup(x)  # x may be NIL; transplant has already set its parent
         
     
     
@@ -171,9 +181,8 @@ class RBTree:
                         self.flip_color(w)
                         self.right_rotate(w)
                         w = x.parent.right
-                    self.flip_color(w)
-                    w.color = x.parent.color
-                    self.flip_color(x.parent)
+                    self.set_color(w, x.parent.color)
+                    self.set_color(x.parent, 'black')
                     self.flip_color(w.right)
                     self.left_rotate(x.parent)
                     x = self.root
@@ -193,16 +202,19 @@ class RBTree:
                         self.flip_color(w)
                         self.left_rotate(w)
                         w = x.parent.left
-                    self.flip_color(w)
-                    w.color = x.parent.color
-                    self.flip_color(x.parent)
+                    self.set_color(w, x.parent.color)
+                    self.set_color(x.parent, 'black')
                     self.flip_color(w.left)
                     self.right_rotate(x.parent)
                     x = self.root
-        if x != self.NIL:
-            self.flip_color(x) 
+        self.set_color(x, 'black')
         
     
+    def set_color(self, node, color):
+        # Set the color of the given node, counting the change like a flip if the color differs.
+        if node is not None and node != self.NIL and node.color != color:
+            self.flip_color(node)
+
     def flip_color(self, node):
     # Flip the color of the given node in the Red-Black Tree.
     # This method is used in balancing operations after insertions or deletions.
@@ -243,6 +255,8 @@ class RBTree:
             node.left = self.NIL
             node.right = self.NIL
             node.color = 'red'
+            self.finger = node  # The newly inserted node becomes the last accessed node
+            self.node_count += 1
             self.fix_insert(node)
             print(f'Node with book_id: {node.book_id} inserted')
         
@@ -281,6 +295,7 @@ class RBTree:
                     self.flip_color(node.parent)
                     self.flip_color(node.parent.parent)
                     self.left_rotate(node.parent.parent)
+        self.set_color(self.root, 'black')  # The root is always black
             
     
 
@@ -291,7 +306,7 @@ class RBTree:
 
             y = x.right
             x.right = y.left
-            if y.left is not None:
+            if y.left is not None and y.left != self.NIL:
                 y.left.parent = x
 
             y.parent = x.parent
@@ -315,7 +330,7 @@ class RBTree:
 
             x = y.left
             y.left = x.right
-            if x.right is not None:
+            if x.right is not None and x.right != self.NIL:
                 x.right.parent = y
 
             x.parent = y.parent
@@ -349,7 +364,7 @@ class RBTree:
                 if book_id1 < node.book_id:
                     self._print_books_range(node.left, book_id1, book_id2, book_details_list)
                     # Process the current node if its book ID is within the specified range
-                if book_id1 <= node.book_id <= book_id2:
+                if book_id1 <= node.book_id <= book_id2 and not node.deleted:
                     # Extract only the patron IDs from the reservations heap
                     reservations = [str(res[2]) for res in node.reservation_heap.heap] if node.reservation_heap.heap else []
                     # Format the book details as a multi-line string
@@ -376,15 +391,146 @@ class RBTree:
                 return self.search(node.left, book_id)
             else:
                 return self.search(node.right, book_id)
+
+    def finger_search(self, book_id):
+        # Search for a book by its ID starting from the finger instead of the root.
+        # The walk climbs parent pointers only until an ancestor's subtree can contain the key,
+        # then descends. For consecutive or clustered lookups this usually means a few levels,
+        # but it is not an O(log d) guarantee: two adjacent keys on opposite sides of the root
+        # still need a climb to the root. To keep non-local lookups at root-search cost, the
+        # finger is only used for keys within 2 ** finger_climb_limit of it, and the climb is
+        # capped at finger_climb_limit levels before restarting from the root. A limit of 0
+        # disables the finger. Rotations only relink parent pointers, so the finger stays
+        # valid through them.
+        NIL = self.NIL
+        node = self.finger
+        limit = self.finger_climb_limit
+        if node == NIL or limit <= 0 or abs(book_id - node.book_id) >> limit:
+            node = self.root  # No finger, or the key is too far from it to be worth climbing
+        elif book_id != node.book_id:
+            # A left child's subtree is bounded above by its parent and a right child's below,
+            # so climb until the parent bounds the key on the far side from the finger.
+            climbs = limit
+            going_right = book_id > node.book_id
+            while climbs:
+                parent = node.parent
+                if parent is None:
+                    break  # Reached the root, which covers every key
+                climbs -= 1
+                if (node == parent.left) == going_right:
+                    parent_id = parent.book_id
+                    if parent_id == book_id:
+                        node = parent
+                        break
+                    if (book_id < parent_id) == going_right:
+                        break
+                node = parent
+            else:
+                node = self.root  # Climbed too far; search from the root instead
+
+        # Descend from the chosen ancestor; a hit becomes the new finger.
+        while node != NIL and book_id != node.book_id:
+            node = node.left if book_id < node.book_id else node.right
+        if node == NIL:
+            return NIL
+        self.finger = node
+        if node.deleted:
+            return NIL  # Tombstoned books are treated as missing
+        return node
+
+    def predecessor(self, node):
+        # Return the node with the next smaller book ID, or None if there is none.
+        if node.left != self.NIL:
+            node = node.left
+            while node.right != self.NIL:
+                node = node.right
+            return node
+        parent = node.parent
+        while parent is not None and parent != self.NIL and node == parent.left:
+            node = parent
+            parent = parent.parent
+        return parent if parent != self.NIL else None
+
+    def successor(self, node):
+        # Return the node with the next larger book ID, or None if there is none.
+        if node.right != self.NIL:
+            return self.minimum(node.right)
+        parent = node.parent
+        while parent is not None and parent != self.NIL and node == parent.right:
+            node = parent
+            parent = parent.parent
+        return parent if parent != self.NIL else None
+
+    def mark_deleted(self, node):
+        # Deferred delete: flag the node as a tombstone without unlinking or rebalancing.
+        # The node stays in the tree until compact() rebuilds it.
+        if node is None or node == self.NIL or node.deleted:
+            return
+        node.deleted = True
+        self.tombstone_count += 1
+
+    def revive(self, node, book_name, author_name, availability_status):
+        # Reuse a tombstoned node for a book inserted again under the same ID.
+        node.book_name = book_name
+        node.author_name = author_name
+        node.availability_status = availability_status
+        node.borrowed_by = None
+        node.reservation_heap = BinaryMinHeap()
+        node.deleted = False
+        self.tombstone_count -= 1
+        self.finger = node
+
+    def compact(self):
+        # Rebuild the tree from its live nodes, dropping every tombstone.
+        # An in-order walk yields the live nodes already sorted, and the tree is rebuilt
+        # by splitting on the middle node, so the whole rebuild runs in linear time.
+        live_nodes = []
+        stack = []
+        node = self.root
+        while stack or (node is not None and node != self.NIL):
+            if node is not None and node != self.NIL:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                if not node.deleted:
+                    live_nodes.append(node)
+                node = node.right
+
+        # Every level is full except possibly the deepest one. Colouring the deepest
+        # level red and the rest black keeps the black height equal on all paths.
+        red_depth = len(live_nodes).bit_length() - 1
+        self.root = self._build_balanced(live_nodes, 0, len(live_nodes) - 1, None, 0, red_depth)
+        self.node_count = len(live_nodes)
+        self.tombstone_count = 0
+        self.finger = self.NIL
+
+    def _build_balanced(self, nodes, low, high, parent, depth, red_depth):
+        # Link nodes[low..high] into a balanced subtree under the given parent and return its root.
+        if low > high:
+            return self.NIL
+        mid = (low + high) // 2
+        node = nodes[mid]
+        node.parent = parent
+        node.color = 'red' if depth == red_depth and depth > 0 else 'black'
+        node.left = self._build_balanced(nodes, low, mid - 1, node, depth + 1, red_depth)
+        node.right = self._build_balanced(nodes, mid + 1, high, node, depth + 1, red_depth)
+        return node
         
 
 
 class GatorLibrary:
 
-    def __init__(self):
+    def __init__(self, deferred_delete=False, tombstone_threshold=0.25, finger_climb_limit=0):
         # Initialize the library with a Red-Black Tree to store book data and a counter for color flips.
-        self.rb_tree = RBTree()
+        # finger_climb_limit is passed to the tree. It defaults to 0, which makes every lookup start
+        # from the root; finger search only pays off for runs of near-consecutive IDs (see README).
+        # With deferred_delete, DeleteBook only tombstones the node; the tree is compacted once
+        # tombstones exceed tombstone_threshold as a fraction of the nodes in the tree.
+        self.rb_tree = RBTree(finger_climb_limit)
         self.color_flip_count = 0  # To keep track of color flip counts during insertions
+        self.deferred_delete = deferred_delete
+        self.tombstone_threshold = tombstone_threshold
     
         
     def read_commands_from_file(self, input_filename):
@@ -402,6 +548,13 @@ class GatorLibrary:
 
     def insert_book(self, book_id, book_name, author_name, availability_status):
         
+            # Reuse a tombstoned node with the same ID instead of adding a duplicate
+            if self.rb_tree.tombstone_count:
+                node = self.rb_tree.search(self.rb_tree.root, book_id)
+                if node != self.rb_tree.NIL and node.deleted:
+                    self.rb_tree.revive(node, book_name, author_name, availability_status)
+                    return ""
+
             # Insert book into the Red-Black Tree
             new_book = Node(book_id, book_name, author_name, availability_status, None, BinaryMinHeap())
             self.rb_tree.insert(new_book)
@@ -413,7 +566,7 @@ class GatorLibrary:
 
     def print_book(self, book_id):
             # Print details of the book with the given book_id
-            node = self.rb_tree.search(self.rb_tree.root, book_id)
+            node = self.rb_tree.finger_search(book_id)
             if node and node != self.rb_tree.NIL:
                 reservations = [str(reservation[2]) for reservation in node.reservation_heap.heap]  # Extract patron IDs
                 formatted_reservations = f"[{', '.join(reservations)}]" if reservations else "[]"
@@ -446,8 +599,8 @@ class GatorLibrary:
 
 
     def borrow_book(self, patron_id, book_id, patron_priority):
-        node = self.rb_tree.search(self.rb_tree.root, book_id)
-        if not node:
+        node = self.rb_tree.finger_search(book_id)
+        if not node or node == self.rb_tree.NIL:
             return "BookID not found in the Library\n"
 
         # Check if the book is already borrowed by the same patron
@@ -477,7 +630,7 @@ class GatorLibrary:
         
 
     def return_book(self, patron_id, book_id):
-        node = self.rb_tree.search(self.rb_tree.root, book_id)
+        node = self.rb_tree.finger_search(book_id)
         if not node or node == self.rb_tree.NIL:
             return "BookID not found in the Library\n"
 
@@ -511,53 +664,81 @@ class GatorLibrary:
         
 
     def _find_closest_book(self, node, target_id, closest_books):
-        
-        if node is None or node == self.rb_tree.NIL:
-            return closest_books
+        for candidate in self._nearest_live_books(node, target_id):
+            if candidate is None or candidate in closest_books:
+                continue
+            if not closest_books:
+                closest_books.append(candidate)
+            else:
+                current_distance = abs(target_id - candidate.book_id)
+                closest_distance = abs(target_id - closest_books[0].book_id)
 
-        if not closest_books:
-            closest_books.append(node)
-        else:
-            current_distance = abs(target_id - node.book_id)
-            closest_distance = abs(target_id - closest_books[0].book_id)
+                if current_distance < closest_distance:
+                    closest_books = [candidate]
+                elif current_distance == closest_distance:
+                    closest_books.append(candidate)
 
-            if current_distance < closest_distance:
-                closest_books = [node]
-            elif current_distance == closest_distance:
-                closest_books.append(node)
+        return closest_books
 
-        if node.book_id < target_id:
-            # Check right subtree
-            closest_books = self._find_closest_book(node.right, target_id, closest_books)
-        else:
-            # Check left subtree
-            closest_books = self._find_closest_book(node.left, target_id, closest_books)
+    def _nearest_live_books(self, node, target_id):
+        # Return the nearest live books below and above target_id, None where there is none.
+        # Walk the search path for target_id, keeping the nearest book on each side of it.
+        floor_node = None  # Largest book ID <= target_id
+        ceiling_node = None  # Smallest book ID >= target_id
+        while node is not None and node != self.rb_tree.NIL:
+            if node.book_id == target_id:
+                floor_node = ceiling_node = node
+                break
+            if node.book_id < target_id:
+                floor_node = node
+                node = node.right  # Check right subtree
+            else:
+                ceiling_node = node
+                node = node.left  # Check left subtree
 
-        return closest_books
+        # Tombstoned books are skipped by stepping to their in-order neighbours. Skipping k
+        # tombstones costs O(k + log n), and tombstone_threshold bounds how many can build up
+        # before compact_if_needed rebuilds the tree between commands.
+        while floor_node is not None and floor_node.deleted:
+            floor_node = self.rb_tree.predecessor(floor_node)
+        while ceiling_node is not None and ceiling_node.deleted:
+            ceiling_node = self.rb_tree.successor(ceiling_node)
+
+        return floor_node, ceiling_node
 
     
     
     def delete_book(self, book_id):
-        node = self.rb_tree.search(self.rb_tree.root, book_id)
+        node = self.rb_tree.finger_search(book_id)
         if node is not None and node != self.rb_tree.NIL:
             # Notify patrons if there are active reservations
+            message = f"Book {book_id} is no longer available."
             if node.reservation_heap.heap:
                 patrons_to_notify = [str(heap_node[2]) for heap_node in node.reservation_heap.heap]
                 node.reservation_heap.heap = []  # Clear reservations
-                self.rb_tree.delete(node)
-                self.color_flip_count += self.rb_tree.insert_fixup_count
-                self.rb_tree.insert_fixup_count = 0  # Reset the fix-up count
-                return f"Book {book_id} is no longer available. Reservations made by Patrons {','.join(patrons_to_notify)} have been cancelled!\n"
-            
+                message += f" Reservations made by Patrons {','.join(patrons_to_notify)} have been cancelled!"
+
+            if self.deferred_delete:
+                # Tombstone the node; the tree is rebalanced later by compact_if_needed
+                self.rb_tree.mark_deleted(node)
             else:
-                # Delete the book if there are no reservations
                 self.rb_tree.delete(node)
                 self.color_flip_count += self.rb_tree.insert_fixup_count
-                self.rb_tree.insert_fixup_count = 0 
-                return f"Book {book_id} is no longer available.\n"
+                self.rb_tree.insert_fixup_count = 0  # Reset the fix-up count
+            return message + "\n"
         else:
             return "BookID not found in the Library.\n"
 
+    def compact_if_needed(self):
+        # Compact the tree once tombstones pass the configured fraction of its nodes.
+        # Called between commands so that bursts of deletes are not slowed down by rebuilds.
+        # Returns True if a compaction ran.
+        rb_tree = self.rb_tree
+        if rb_tree.tombstone_count and rb_tree.tombstone_count > self.tombstone_threshold * rb_tree.node_count:
+            rb_tree.compact()
+            return True
+        return False
+
     def run_command(self, command):
          # Parse and execute a given command string, handling various library operations.
         
@@ -658,18 +839,42 @@ class GatorLibrary:
 if __name__ == "__main__":
     import sys
 
+    usage = ("Usage: python gator_library.py <input_filename> [--deferred-delete] "
+             "[--tombstone-threshold=<fraction>] [--finger-climb-limit=<levels>]")
+
+    # Separate the input filename from the optional library settings
+    filenames = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = [arg for arg in sys.argv[1:] if arg.startswith('--')]
+
     # Check if the correct number of arguments is given
-    if len(sys.argv) != 2:
-        print("Usage: python gator_library.py <input_filename>")
+    if len(filenames) != 1:
+        print(usage)
+        sys.exit(1)
+
+    # Library settings: deferred (tombstoned) deletes and finger search tuning
+    library_options = {}
+    try:
+        for option in options:
+            if option == '--deferred-delete':
+                library_options['deferred_delete'] = True
+            elif option.startswith('--tombstone-threshold='):
+                library_options['tombstone_threshold'] = float(option.split('=', 1)[1])
+            elif option.startswith('--finger-climb-limit='):
+                library_options['finger_climb_limit'] = int(option.split('=', 1)[1])
+            else:
+                raise ValueError(f"unknown option {option}")
+    except ValueError as e:
+        print(f"Invalid option: {e}")
+        print(usage)
         sys.exit(1)
 
     # Get the input filename from command line argument
-    input_filename = sys.argv[1]
+    input_filename = filenames[0]
     # Determine the output filename based on the input filename
     output_filename = input_filename.split('.')[0] + "_output_file.txt"
     
     # Instantiate the library system
-    library_system = GatorLibrary()
+    library_system = GatorLibrary(**library_options)
 
     # Read commands from the input file
     commands = library_system.read_commands_from_file(input_filename)
@@ -682,6 +887,7 @@ if __name__ == "__main__":
             output_lines.append(result)
             break
         output_lines.append(result)
+        library_system.compact_if_needed()  # Runs after the result is recorded, off the command path
 
     # Write the results to the output file
     library_system.write_output_to_file(output_filename, output_lines)
@@ -0,0 +1,194 @@
+# Regression tests for the GatorLibrary Red-Black Tree
+# Run with: python3 -m unittest test_gatorLibrary  (or python3 -m pytest)
+import contextlib
+import io
+import random
+import unittest
+
+from gatorLibrary import GatorLibrary
+
+
+def build_library(book_ids, **library_options):
+    # Build a library through run_command, the same path used for input files.
+    library = GatorLibrary(**library_options)
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence the per-insert log lines
+        for book_id in book_ids:
+            library.run_command(f'InsertBook({book_id}, "Title {book_id}", "Author", "Yes")')
+    return library
+
+
+def book_ids_in(output):
+    # Return the book IDs listed in PrintBook/PrintBooks/FindClosestBook output.
+    return [int(line.split('= ')[1]) for line in output.split('\n') if line.startswith('BookID')]
+
+
+def range_ids(library, book_id1, book_id2):
+    # Return the book IDs PrintBooks would list, without printing them.
+    return book_ids_in(''.join(library.rb_tree.print_books_range(book_id1, book_id2)))
+
+
+def check_red_black(test, rb_tree):
+    # Assert BST order, parent links, no red-red edges and equal black height on every path.
+    def black_height(node, parent, low, high):
+        if node == rb_tree.NIL:
+            return 1
+        test.assertIs(node.parent, parent)
+        test.assertTrue(low < node.book_id < high)
+        if node.color == 'red':
+            test.assertEqual(node.left.color, 'black')
+            test.assertEqual(node.right.color, 'black')
+        left = black_height(node.left, node, low, node.book_id)
+        right = black_height(node.right, node, node.book_id, high)
+        test.assertEqual(left, right)
+        return left + (node.color == 'black')
+    test.assertEqual(rb_tree.root.color, 'black')
+    black_height(rb_tree.root, None, float('-inf'), float('inf'))
+
+
+class FingerSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(26)
+        self.book_ids = self.rng.sample(range(1, 3000), 1000)
+        self.library = build_library(self.book_ids, finger_climb_limit=3)
+        self.rb_tree = self.library.rb_tree
+
+    def assert_matches_root_search(self, book_ids):
+        for book_id in book_ids:
+            expected = self.rb_tree.search(self.rb_tree.root, book_id)
+            self.assertIs(self.rb_tree.finger_search(book_id), expected, book_id)
+
+    def test_matches_root_search_for_all_patterns(self):
+        sequential = list(range(0, 3001))
+        clustered = [center + offset for center in self.rng.sample(range(3000), 50) for offset in range(-20, 21)]
+        uniform = [self.rng.randint(0, 3001) for _ in range(3000)]
+        self.assert_matches_root_search(sequential + clustered + uniform)
+
+    def test_matches_root_search_after_deletes(self):
+        for book_id in self.rng.sample(self.book_ids, 300):
+            self.library.delete_book(book_id)
+        self.assert_matches_root_search(range(0, 3001))
+
+    def test_finger_follows_hits(self):
+        book_id = self.book_ids[0]
+        self.rb_tree.finger_search(book_id)
+        self.assertEqual(self.rb_tree.finger.book_id, book_id)
+
+    def test_finger_moves_to_neighbour_on_delete(self):
+        book_ids = sorted(self.book_ids)
+        target = book_ids[500]
+        self.rb_tree.finger_search(target)
+        self.library.delete_book(target)
+        self.assertIn(self.rb_tree.finger.book_id, (book_ids[499], book_ids[501]))
+        self.assert_matches_root_search(book_ids[490:510])
+
+    def test_neighbours_across_the_root(self):
+        # Adjacent IDs on opposite sides of the root need a full climb; the capped climb
+        # falls back to the root and still finds the book.
+        library = build_library(range(1, 2 ** 12, 2), finger_climb_limit=3)
+        rb_tree = library.rb_tree
+        root_id = rb_tree.root.book_id
+        rb_tree.finger = rb_tree.search(rb_tree.root, root_id - 2)
+        self.assertEqual(rb_tree.finger_search(root_id + 2).book_id, root_id + 2)
+
+    def test_finger_disabled_by_default(self):
+        library = build_library(self.book_ids)
+        rb_tree = library.rb_tree
+        self.assertEqual(rb_tree.finger_climb_limit, 0)
+        for book_id in range(0, 3001):
+            self.assertIs(rb_tree.finger_search(book_id), rb_tree.search(rb_tree.root, book_id))
+
+
+
+class DeleteTest(unittest.TestCase):
+
+    def test_deleted_leaf_is_unlinked(self):
+        library = build_library([5, 3, 8, 1, 4, 9])
+        library.delete_book(1)
+        self.assertEqual(library.print_book(1), "BookID not found in the Library\n")
+        self.assertEqual(range_ids(library, 0, 10), [3, 4, 5, 8, 9])
+
+    def test_deletes_match_reference_set(self):
+        rng = random.Random(27)
+        book_ids = rng.sample(range(1, 1000), 400)
+        library = build_library(book_ids)
+        live = set(book_ids)
+        for book_id in rng.sample(book_ids, 250):
+            library.delete_book(book_id)
+            live.discard(book_id)
+        self.assertEqual(range_ids(library, 0, 1000), sorted(live))
+        self.assertEqual(library.rb_tree.node_count, len(live))
+        check_red_black(self, library.rb_tree)
+
+
+class TombstoneTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(27)
+        self.book_ids = self.rng.sample(range(1, 2000), 600)
+        self.library = build_library(self.book_ids, deferred_delete=True, tombstone_threshold=float('inf'))
+        self.rb_tree = self.library.rb_tree
+
+    def test_delete_marks_tombstone_and_returns_message(self):
+        book_id = self.book_ids[0]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.library.borrow_book(1, book_id, 1)
+            self.library.borrow_book(2, book_id, 1)
+        self.assertEqual(self.library.delete_book(book_id),
+                         f"Book {book_id} is no longer available. Reservations made by Patrons 2 have been cancelled!\n")
+        self.assertEqual(self.rb_tree.tombstone_count, 1)
+        self.assertEqual(self.rb_tree.node_count, len(self.book_ids))
+        self.assertIs(self.rb_tree.finger_search(book_id), self.rb_tree.NIL)
+        self.assertEqual(self.library.delete_book(book_id), "BookID not found in the Library.\n")
+
+    def test_queries_skip_tombstones(self):
+        live = set(self.book_ids)
+        for book_id in self.rng.sample(self.book_ids, 300):
+            self.library.delete_book(book_id)
+            live.discard(book_id)
+        self.assertEqual(range_ids(self.library, 0, 2000), sorted(live))
+        for target_id in range(0, 2001, 7):
+            distance = min(abs(book_id - target_id) for book_id in live)
+            expected = sorted(book_id for book_id in live if abs(book_id - target_id) == distance)
+            self.assertEqual(book_ids_in(self.library.find_closest_book(target_id)), expected, target_id)
+            self.assertEqual(self.library.print_book(target_id).startswith('BookID = '), target_id in live)
+
+    def test_reinsert_revives_tombstone(self):
+        book_id = self.book_ids[0]
+        self.library.delete_book(book_id)
+        self.library.insert_book(book_id, "New Title", "New Author", True)
+        self.assertEqual(self.rb_tree.tombstone_count, 0)
+        self.assertEqual(self.rb_tree.node_count, len(self.book_ids))
+        self.assertIn('Title = "New Title"', self.library.print_book(book_id))
+
+    def test_compaction_drops_tombstones_and_rebalances(self):
+        live = set(self.book_ids)
+        for book_id in self.rng.sample(self.book_ids, 350):
+            self.library.delete_book(book_id)
+            live.discard(book_id)
+        self.library.tombstone_threshold = 0.25
+        self.assertTrue(self.library.compact_if_needed())
+        self.assertEqual(self.rb_tree.tombstone_count, 0)
+        self.assertEqual(self.rb_tree.node_count, len(live))
+        self.assertEqual(range_ids(self.library, 0, 2000), sorted(live))
+        check_red_black(self, self.rb_tree)
+        self.assertFalse(self.library.compact_if_needed())
+
+    def test_compaction_of_every_size_is_red_black(self):
+        for size in range(0, 70):
+            library = build_library(range(1, size + 1), deferred_delete=True)
+            library.rb_tree.compact()
+            check_red_black(self, library.rb_tree)
+
+    def test_closest_book_past_long_tombstone_run(self):
+        library = build_library(range(1, 501), deferred_delete=True, tombstone_threshold=float('inf'))
+        for book_id in range(100, 299):
+            library.delete_book(book_id)
+        self.assertEqual(book_ids_in(library.find_closest_book(199)), [99, 299])
+        self.assertEqual(book_ids_in(library.find_closest_book(150)), [99])
+        self.assertEqual(book_ids_in(library.find_closest_book(250)), [299])
+        self.assertEqual(library.rb_tree.tombstone_count, 199)  # Reads never compact the tree
+
+
+if __name__ == "__main__":
+    unittest.main()